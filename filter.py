@@ -35,10 +35,8 @@ __license__ = "MIT"
 
 import argparse
 import json
-import csv
-import sys
 from copy import copy
-from logzero import logger
+from lazylogger import logger
 
 EVENT_TYPES = ["locked_event", "unlocked_event"]
 
@@ -0,0 +1,44 @@
+"""
+Stand-in for logzero's logger that only imports logzero when a message is
+actually logged. Importing logzero (and logging) takes longer than the rest of
+a small run of filter.py or summarize.py, and at the default verbosity most
+runs never log anything.
+"""
+
+__author__ = "Dustin Rasener"
+__version__ = "0.1.0"
+__license__ = "MIT"
+
+LEVELS = {"debug": 10, "info": 20, "warning": 30, "error": 40, "exception": 40, "critical": 50}
+
+
+class LazyLogger:
+    def __init__(self) -> None:
+        self.level = 10
+        self.logger = None
+
+    def setLevel(self, level):
+        self.level = level
+        if self.logger is not None:
+            self.logger.setLevel(level)
+
+    def get_logger(self):
+        """Import logzero and return its logger"""
+        if self.logger is None:
+            from logzero import logger
+            logger.setLevel(self.level)
+            self.logger = logger
+        return self.logger
+
+    def __getattr__(self, name):
+        if name in LEVELS:
+            def log(*args, **kwargs):
+                if LEVELS[name] >= self.level:
+                    # Report the caller's module and line, not this wrapper's
+                    kwargs.setdefault("stacklevel", 2)
+                    getattr(self.get_logger(), name)(*args, **kwargs)
+            return log
+        return getattr(self.get_logger(), name)
+
+
+logger = LazyLogger()
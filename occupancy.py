@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Build an occupancy index from the visits produced by summarize.py
+
+summarize.py works on one team member at a time, and assumes that member is
+the only one at the property during their visit. This script loads the
+summary files for any number of team members and properties, and answers:
+
+- Who was at a property at a given time? (--at)
+- Which visits overlap a given time range? (--range)
+- Which visits by different team members overlap at the same property? These
+  are the visits for which the lock data can be unreliable, and they are
+  written to the overlap report.
+
+Example:
+$ python occupancy.py rundata/cleaning-summary.json rundata/maintenance-summary.json --at 2023-08-21T14:05:00Z
+"""
+
+__author__ = "Dustin Rasener"
+__version__ = "0.1.0"
+__license__ = "MIT"
+
+import argparse
+import heapq
+import json
+from lazylogger import logger
+from timeutil import parse_timestamp, parse_timestamps
+
+
+class IntervalTree:
+    """
+    Static centered interval tree. Each interval is a (start, end, item) tuple
+    with inclusive endpoints. Queries run in O(log n + k), where k is the
+    number of matching intervals.
+    """
+    def __init__(self, intervals) -> None:
+        self.center = None
+        self.left = None
+        self.right = None
+        self.by_start = []
+        self.by_end = []
+        self.size = len(intervals)
+        if intervals:
+            self.build(intervals)
+
+    def build(self, intervals):
+        """Split the intervals around the median endpoint"""
+        endpoints = sorted(point for interval in intervals for point in interval[:2])
+        self.center = endpoints[len(endpoints) // 2]
+        left, right, here = [], [], []
+        for interval in intervals:
+            if interval[1] < self.center:
+                left.append(interval)
+            elif interval[0] > self.center:
+                right.append(interval)
+            else:
+                here.append(interval)
+        self.by_start = sorted(here, key=lambda x: x[0])
+        self.by_end = sorted(here, key=lambda x: x[1], reverse=True)
+        if left:
+            self.left = IntervalTree(left)
+        if right:
+            self.right = IntervalTree(right)
+
+    def query_point(self, point):
+        """Return the items of all intervals containing point"""
+        return self.query_range(point, point)
+
+    def query_range(self, start, end):
+        """Return the items of all intervals overlapping [start, end]"""
+        found = []
+        pending = [self]
+        while pending:
+            node = pending.pop()
+            if node.center is None:
+                continue
+            if end < node.center:
+                for interval in node.by_start:
+                    if interval[0] > end:
+                        break
+                    found.append(interval[2])
+                if node.left is not None:
+                    pending.append(node.left)
+            elif start > node.center:
+                for interval in node.by_end:
+                    if interval[1] < start:
+                        break
+                    found.append(interval[2])
+                if node.right is not None:
+                    pending.append(node.right)
+            else:
+                found.extend(interval[2] for interval in node.by_start)
+                if node.left is not None:
+                    pending.append(node.left)
+                if node.right is not None:
+                    pending.append(node.right)
+        return found
+
+    def __len__(self):
+        return self.size
+
+
+class OccupancyIndex:
+    """Index of visits by property, built from one or more summary.json files"""
+    def __init__(self, visits) -> None:
+        self.visits = {}
+        for visit in visits:
+            self.visits.setdefault(visit.get("property_address"), []).append(visit)
+        self.intervals = {
+            property_address: get_intervals(property_visits)
+            for property_address, property_visits in self.visits.items()
+        }
+        self.trees = {
+            property_address: IntervalTree(intervals)
+            for property_address, intervals in self.intervals.items()
+        }
+
+    def get_properties(self, property_address=None):
+        """Return the properties to search; all of them if none is given"""
+        if property_address is None:
+            return list(self.trees)
+        return [property_address] if property_address in self.trees else []
+
+    def at(self, timestamp, property_address=None):
+        """Return the visits in progress at the given time"""
+        point = parse_timestamp(timestamp)
+        found = []
+        for prop in self.get_properties(property_address):
+            found.extend(self.trees[prop].query_point(point))
+        return sorted(found, key=lambda v: v["start_time"])
+
+    def between(self, start, end, property_address=None):
+        """Return the visits that overlap the given time range"""
+        start, end = parse_timestamp(start), parse_timestamp(end)
+        found = []
+        for prop in self.get_properties(property_address):
+            found.extend(self.trees[prop].query_range(start, end))
+        return sorted(found, key=lambda v: v["start_time"])
+
+    def get_overlaps(self, property_address=None):
+        """
+        Return pairs of visits by different team members that overlap at the
+        same property. Sweeps each property's visits in start order, keeping
+        the visits still in progress in a heap ordered by end time, so the cost
+        is O(n log n + k) rather than comparing every pair of visits.
+        """
+        overlaps = []
+        for prop in self.get_properties(property_address):
+            intervals = sorted(self.intervals[prop], key=lambda x: x[0])
+            active = []
+            for i, (start, end, visit) in enumerate(intervals):
+                while active and active[0][0] < start:
+                    heapq.heappop(active)
+                for _, j in active:
+                    other = intervals[j][2]
+                    if other["username"] != visit["username"]:
+                        overlaps.append(get_overlap(prop, other, visit))
+                heapq.heappush(active, (end, i))
+        return overlaps
+
+
+def get_intervals(visits):
+    """Return a (start, end, visit) interval for each visit, in epoch seconds"""
+    starts = parse_timestamps([v["start_time"] for v in visits]).tolist()
+    ends = parse_timestamps([v["end_time"] for v in visits]).tolist()
+    return list(zip(starts, ends, visits))
+
+def get_overlap(property_address, first, second):
+    """Describe the overlap between two visits"""
+    overlap_start = max(first["start_time"], second["start_time"])
+    overlap_end = min(first["end_time"], second["end_time"])
+    return {
+        "property_address": property_address,
+        "start_time": overlap_start,
+        "end_time": overlap_end,
+        "minutes": (parse_timestamp(overlap_end) - parse_timestamp(overlap_start)) / 60,
+        "visits": [first, second],
+    }
+
+def format_visit(visit):
+    """Format a visit for display"""
+    return f"{visit['username']}, {visit.get('property_address')}, {visit['start_time']} - {visit['end_time']}"
+
+def main(args):
+    logger.setLevel(10 * (4 - args.verbose))
+
+    visits = []
+    for path in args.inputs:
+        with open(path, "r") as f:
+            visits.extend(json.load(f))
+    logger.info(f"Loaded {len(visits)} visits from {len(args.inputs)} files")
+
+    index = OccupancyIndex(visits)
+
+    if args.at is not None:
+        for visit in index.at(args.at, args.property):
+            print(format_visit(visit))
+
+    if args.range is not None:
+        for visit in index.between(args.range[0], args.range[1], args.property):
+            print(format_visit(visit))
+
+    overlaps = index.get_overlaps(args.property)
+    with open(args.output, "w") as f:
+        json.dump(overlaps, f, indent=4)
+
+    if not args.quiet:
+        print(f"Found {len(overlaps)} overlapping visits by different team members. Cross-check these with your cameras or other sources of information.")
+
+
+if __name__ == "__main__":
+    """ This is executed when run from the command line """
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument("inputs", nargs="*", default=["rundata/summary.json"], help="JSON files with visit output from summarize.py")
+
+    # optional point-in-time query
+    parser.add_argument("-a", "--at", help="List visits in progress at this time (e.g. 2023-08-21T14:05:00Z)")
+
+    # optional range query
+    parser.add_argument("-r", "--range", nargs=2, metavar=("START", "END"), help="List visits overlapping this time range")
+
+    # optional property filter
+    parser.add_argument("-p", "--property", help="Only consider visits to this Property Address")
+
+    # optional argument for overlap report
+    parser.add_argument("-o", "--output", default="rundata/overlaps.json", help="Overlap report output file")
+
+    # optional argument to suppress output
+    parser.add_argument("-q", "--quiet", action="store_true", help="Suppress output")
+
+    # Optional verbosity counter (eg. -v, -vv, -vvv, etc.)
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="count",
+        default=0,
+        help="Verbosity (-v, -vv, etc)")
+
+    # Specify output of "--version"
+    parser.add_argument(
+        "--version",
+        action="version",
+        version="%(prog)s (version {version})".format(version=__version__))
+
+    args = parser.parse_args()
+    main(args)
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Roll up the visits produced by summarize.py into weekly and monthly reports
+
+Visits are loaded into NumPy columns, and the totals, averages and visit counts
+for each team member and property are computed per ISO week and per month.
+The report also includes duration percentiles across all visits, and flags
+visits whose duration is an outlier (outside 1.5 times the interquartile
+range), which are often caused by a missed lock or unlock event.
+
+Example:
+$ python report.py rundata/cleaning.json rundata/maintenance.json
+Found 42 visits: 18 weekly and 6 monthly rollups, 3 outliers.
+"""
+
+__author__ = "Dustin Rasener"
+__version__ = "0.1.0"
+__license__ = "MIT"
+
+import argparse
+import csv
+import json
+import numpy as np
+from logzero import logger
+from timeutil import parse_timestamps
+
+PERCENTILES = [5, 25, 50, 75, 95]
+
+
+class VisitColumns:
+    """Visits from one or more summary.json files, stored as typed columns"""
+    def __init__(self, visits) -> None:
+        self.visits = visits
+        self.usernames, self.username_codes = np.unique(
+            np.array([v["username"] for v in visits], dtype=str), return_inverse=True)
+        self.properties, self.property_codes = np.unique(
+            np.array([v.get("property_address") or "" for v in visits], dtype=str), return_inverse=True)
+        self.start_times = parse_timestamps([v["start_time"] for v in visits]).astype("datetime64[s]")
+        self.minutes = np.array([v["time_between_events"] for v in visits], dtype=np.float64)
+
+    def __len__(self):
+        return len(self.visits)
+
+    def get_iso_weeks(self):
+        """Return the ISO week of each visit, e.g. 2023-W34"""
+        days = self.start_times.astype("datetime64[D]")
+        # 1970-01-01 was a Thursday; ISO weeks start on Monday
+        weekdays = (days.astype(np.int64) + 3) % 7
+        thursdays = days - weekdays + 3
+        years = thursdays.astype("datetime64[Y]")
+        weeks = (thursdays - years.astype("datetime64[D]")).astype(np.int64) // 7 + 1
+        return np.char.add(np.char.add(years.astype(str), "-W"), np.char.zfill(weeks.astype(str), 2))
+
+    def get_months(self):
+        """Return the month of each visit, e.g. 2023-08"""
+        return self.start_times.astype("datetime64[M]").astype(str)
+
+    def rollup(self, periods):
+        """
+        Group visits by period, team member and property, and return the visit
+        count, total hours and average hours of each group
+        """
+        period_labels, period_codes = np.unique(periods, return_inverse=True)
+        keys = (period_codes * len(self.usernames) + self.username_codes) * len(self.properties) + self.property_codes
+        groups, group_codes = np.unique(keys, return_inverse=True)
+        counts = np.bincount(group_codes)
+        total_minutes = np.bincount(group_codes, weights=self.minutes)
+
+        property_index = groups % len(self.properties)
+        username_index = groups // len(self.properties) % len(self.usernames)
+        period_index = groups // len(self.properties) // len(self.usernames)
+
+        return [
+            {
+                "Period": str(period_labels[period_index[i]]),
+                "Team Member": str(self.usernames[username_index[i]]),
+                "Property Address": str(self.properties[property_index[i]]),
+                "Visits": int(counts[i]),
+                "Total Hours": round(float(total_minutes[i]) / 60, 2),
+                "Average Hours": round(float(total_minutes[i] / counts[i]) / 60, 2),
+            }
+            for i in range(len(groups))
+        ]
+
+    def get_percentiles(self):
+        """Return duration percentiles in minutes across all visits"""
+        values = np.percentile(self.minutes, PERCENTILES)
+        return {f"p{p}": round(float(value), 1) for p, value in zip(PERCENTILES, values)}
+
+    def get_outliers(self):
+        """Return visits whose duration is outside 1.5 times the interquartile range"""
+        q1, q3 = np.percentile(self.minutes, [25, 75])
+        iqr = q3 - q1
+        flagged = (self.minutes < q1 - 1.5 * iqr) | (self.minutes > q3 + 1.5 * iqr)
+        return [self.visits[i] for i in np.flatnonzero(flagged)]
+
+
+def main(args):
+    logger.setLevel(10 * (4 - args.verbose))
+
+    visits = []
+    for path in args.inputs:
+        with open(path, "r") as f:
+            visits.extend(json.load(f))
+    if not visits:
+        logger.error("No visits found in: {}".format(", ".join(args.inputs)))
+        exit(1)
+
+    columns = VisitColumns(visits)
+    weekly = columns.rollup(columns.get_iso_weeks())
+    monthly = columns.rollup(columns.get_months())
+    outliers = columns.get_outliers()
+
+    with open(args.output, "w") as f:
+        json.dump({
+            "percentiles": columns.get_percentiles(),
+            "weekly": weekly,
+            "monthly": monthly,
+            "outliers": outliers,
+        }, f, indent=4)
+
+    with open(args.csv, "w") as f:
+        fields = ["Period Type", "Period", "Team Member", "Property Address", "Visits", "Total Hours", "Average Hours"]
+        writer = csv.DictWriter(f, fieldnames=fields, lineterminator='\n')
+        writer.writeheader()
+        for period_type, rows in (("Week", weekly), ("Month", monthly)):
+            for row in rows:
+                writer.writerow({"Period Type": period_type, **row})
+
+    if not args.quiet:
+        print(f"Found {len(columns)} visits: {len(weekly)} weekly and {len(monthly)} monthly rollups, {len(outliers)} outliers.")
+
+
+if __name__ == "__main__":
+    """ This is executed when run from the command line """
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument("inputs", nargs="*", default=["rundata/summary.json"], help="JSON files with visit output from summarize.py")
+
+    # optional argument for output file
+    parser.add_argument("-o", "--output", default="rundata/report.json", help="Output file")
+
+    # optional argument for csv output
+    parser.add_argument("-c", "--csv", default="rundata/report.csv", help="CSV output file")
+
+    # optional argument to suppress output
+    parser.add_argument("-q", "--quiet", action="store_true", help="Suppress output")
+
+    # Optional verbosity counter (eg. -v, -vv, -vvv, etc.)
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="count",
+        default=0,
+        help="Verbosity (-v, -vv, etc)")
+
+    # Specify output of "--version"
+    parser.add_argument(
+        "--version",
+        action="version",
+        version="%(prog)s (version {version})".format(version=__version__))
+
+    args = parser.parse_args()
+    main(args)
@@ -1,6 +1,12 @@
 #!/usr/bin/env python3
 """
 Extract the request data from a HAR file
+
+The HAR file is read incrementally, one request at a time, so large HAR files
+with response bodies don't need to fit in memory. Requests are matched by
+method and URL, and all of the request files in the config directory are
+written in a single pass. Cookies are stripped from the saved headers; the
+scripts supply their own session cookie.
 """
 
 __author__ = "Dustin Rasener"
@@ -8,46 +14,70 @@ __version__ = "0.1.0"
 __license__ = "MIT"
 
 import argparse
+import ijson
 import json
+import os
+import re
 from logzero import logger
 
+# (output file, method, URL pattern) for each request used by the scripts
+REQUESTS = [
+    ("auth-preauth-request.json", "GET", re.compile(r"^https://connect\.remotelock\.com/sign-in/?(\?|$)")),
+    ("auth-request.json", "POST", re.compile(r"^https://connect\.remotelock\.com/session/?(\?|$)")),
+    ("collect-request.json", "POST", re.compile(r"^https://connect\.remotelock\.com/api/events/?(\?|$)")),
+]
+
+SENSITIVE_HEADERS = ["cookie"]
 
-def main(args):
-    logger.setLevel(10 * (4 - args.verbose))
 
-    with open(args.harfile, 'r') as f:
-        har = json.load(f)
+def match_request(request, pending):
+    """Return the output file for the first pending request that matches"""
+    for output, method, url_pattern in pending:
+        if request.get("method") == method and url_pattern.match(request.get("url", "")):
+            return output
 
-        # Extract the URL and headers from the first request
-        url = har['log']['entries'][args.request_index]['request']['url']
-        logger.info(f"URL: {url}")
-        headers = har['log']['entries'][args.request_index]['request']['headers']
-        headers = {header['name']: header['value'] for header in headers}
-        logger.debug(f"Headers: {headers}")
+def get_request_data(request):
+    """Return the request data to be saved, without sensitive headers"""
+    url = request['url']
+    logger.info(f"URL: {url}")
+    headers = {header['name']: header['value'] for header in request['headers']
+               if header['name'].lower() not in SENSITIVE_HEADERS}
+    logger.debug(f"Headers: {headers}")
+    method = request['method']
+    logger.debug(f"Method: {method}")
+
+    request_data = {'url': url, 'method': method, 'headers': headers}
+    if method != 'GET':
+        request_data['body'] = request['postData']['text']
+    return request_data
+
+def main(args):
+    logger.setLevel(10 * (4 - args.verbose))
 
-        # Extract the request method and body from the first request
-        method = har['log']['entries'][args.request_index]['request']['method']
-        logger.debug(f"Method: {method}")
-        if method == 'GET':
-            body = None
-        else:
-            body = har['log']['entries'][args.request_index]['request']['postData']['text']
+    pending = list(REQUESTS)
+    with open(args.harfile, 'rb') as f:
+        # Only the request of each entry is built; responses are skipped
+        for request in ijson.items(f, 'log.entries.item.request'):
+            output = match_request(request, pending)
+            if output is None:
+                continue
+            with open(os.path.join(args.config_dir, output), 'w') as outfile:
+                json.dump(get_request_data(request), outfile, indent=4)
+            print(f"Wrote {output}")
+            pending = [item for item in pending if item[0] != output]
+            if not pending:
+                break
 
-        # write a JSON file with the request data
-        with open(args.output, 'w') as outfile:
-            request_data = {'url': url, 'method': method, 'headers': headers}
-            if body is not None:
-                request_data['body'] = body
-            json.dump(request_data, outfile, indent=4)
+    for output, method, url_pattern in pending:
+        logger.error(f"No {method} request matching {url_pattern.pattern} found for {output}")
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
 
-    parser.add_argument("harfile", help="HAR file containing request made to the RemoteLock API")
-    parser.add_argument("request_index", type=int, help="Index of the request to extract from the HAR file")
+    parser.add_argument("harfile", help="HAR file containing requests made to the RemoteLock API")
 
-    parser.add_argument("-o", "--output", default="request.json", help="Output file for the request data")
+    parser.add_argument("-d", "--config_dir", default="config", help="Directory to write the request files to")
 
     # Optional verbosity counter (eg. -v, -vv, -vvv, etc.)
     parser.add_argument(
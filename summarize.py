@@ -8,10 +8,10 @@ __version__ = "0.1.0"
 __license__ = "MIT"
 
 import argparse
-import datetime
 import json
 import csv
-from logzero import logger
+from lazylogger import logger
+from timeutil import format_date, parse_timestamp
 
 
 class REPStrackerData:
@@ -41,7 +41,7 @@ class REPStrackerData:
         # date in the format 01/01/1970
         minutes = round(minutes)
         data = {
-            "Date": datetime.datetime.strptime(date, "%Y-%m-%dT%H:%M:%SZ").strftime("%m/%d/%Y"),
+            "Date": format_date(date),
             "Hours": minutes // 60,
             "Minutes": minutes % 60,
             "Property Address": self.property_address,
@@ -86,11 +86,11 @@ def find_end_event(events, start_index):
 
 def calculate_time_between_events(start_event, end_event):
     """
-    Calculate the time between two events
+    Calculate the time between two events in seconds
     """
     start_time = start_event["time"]
     end_time = end_event["time"]
-    return datetime.datetime.strptime(end_time, "%Y-%m-%dT%H:%M:%SZ") - datetime.datetime.strptime(start_time, "%Y-%m-%dT%H:%M:%SZ")            
+    return parse_timestamp(end_time) - parse_timestamp(start_time)
 
 def get_summary(start_event, end_event):
     """
@@ -106,7 +106,7 @@ def get_summary(start_event, end_event):
         "username": username,
         "start_time": start_time,
         "end_time": end_time,
-        "time_between_events": time_between_events.total_seconds() / 60
+        "time_between_events": time_between_events / 60
     }
 
 def main(args):
@@ -133,7 +133,9 @@ def main(args):
         end_event = find_end_event(events, start_index)
         if end_event is None:
             logger.error("No end event found for user: {}".format(args.username))            
-        visits.append(get_summary(start_event, end_event))
+        summary = get_summary(start_event, end_event)
+        summary["property_address"] = args.property_address
+        visits.append(summary)
         start_index = find_next_event_index_for_user(events, start_index, args.username)
         if start_index is None:
             break
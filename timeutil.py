@@ -0,0 +1,30 @@
+"""
+Shared helpers for the timestamps returned by the RemoteLock API, which look
+like 2023-08-21T11:31:46Z (ISO-8601, UTC)
+"""
+
+__author__ = "Dustin Rasener"
+__version__ = "0.1.0"
+__license__ = "MIT"
+
+import datetime
+from functools import lru_cache
+
+
+def parse_timestamp(timestamp):
+    """Convert a timestamp to epoch seconds"""
+    return int(datetime.datetime.fromisoformat(timestamp.replace("Z", "+00:00")).timestamp())
+
+def parse_timestamps(timestamps):
+    """Convert a list of timestamps to a NumPy array of epoch seconds"""
+    import numpy as np
+    return np.array([timestamp.rstrip("Z") for timestamp in timestamps], dtype="datetime64[s]").astype(np.int64)
+
+def format_date(timestamp):
+    """Convert a timestamp to a date in the format 01/01/1970"""
+    return _format_date(timestamp[:10])
+
+@lru_cache(maxsize=None)
+def _format_date(date):
+    year, month, day = date.split("-")
+    return f"{month}/{day}/{year}"